@@ -1,34 +1,61 @@
 // api/_lib/cache.js
-const store = new Map();
+// Bounded in-process LRU with per-entry TTL. Map keeps insertion order, so the
+// first key is always the least recently used one.
 
 /**
- * Get cached value if not expired.
- * @param {string} key
+ * Create an independent LRU store holding at most `maxEntries` keys.
+ * @param {number} maxEntries
  */
-export function get(key) {
-  const entry = store.get(key);
-  if (!entry) return undefined;
-  if (entry.expiresAt && entry.expiresAt < Date.now()) {
+export function createCache(maxEntries = 1024) {
+  const store = new Map();
+
+  /**
+   * Get cached value if not expired.
+   * @param {string} key
+   */
+  function get(key) {
+    const entry = store.get(key);
+    if (!entry) return undefined;
+    if (entry.expiresAt && entry.expiresAt < Date.now()) {
+      store.delete(key);
+      return undefined;
+    }
+    // Refresh recency
+    store.delete(key);
+    store.set(key, entry);
+    return entry.value;
+  }
+
+  /**
+   * Set cached value with TTL (default 5 minutes).
+   * @param {string} key
+   * @param {any} value
+   * @param {number} ttlMs
+   */
+  function set(key, value, ttlMs = 5 * 60 * 1000) {
     store.delete(key);
-    return undefined;
+    store.set(key, {
+      value,
+      expiresAt: ttlMs > 0 ? Date.now() + ttlMs : 0
+    });
+    while (store.size > maxEntries) {
+      store.delete(store.keys().next().value);
     }
-  return entry.value;
-}
+  }
 
-/**
- * Set cached value with TTL (default 5 minutes).
- * @param {string} key
- * @param {any} value
- * @param {number} ttlMs
- */
-export function set(key, value, ttlMs = 5 * 60 * 1000) {
-  store.set(key, {
-    value,
-    expiresAt: ttlMs > 0 ? Date.now() + ttlMs : 0
-  });
-}
+  /** Delete a key. */
+  function del(key) {
+    store.delete(key);
+  }
 
-/** Delete a key. */
-export function del(key) {
-  store.delete(key);
+  return { get, set, del };
 }
+
+// Successful lookups
+export const { get, set, del } = createCache(1024);
+export const HIT_TTL_MS = 60 * 60 * 1000;
+
+// Geocodes the upstreams answered with no address, kept apart so bad input
+// cannot evict good entries. Transient upstream errors are not recorded.
+export const misses = createCache(256);
+export const MISS_TTL_MS = 60 * 1000;
@@ -1,11 +1,32 @@
 // api/_lib/geocode-service.js
 import { getPropertyAddress } from "./montana-api-service.js"; // we'll create this next
+import { fetchWithTimeout } from "./http.js";
+
+const CITY_RE = /,\s*([^,]+),\s*MT/i;
+const WHITESPACE_RE = /\s+/g;
+
+// geocode -> pending lookup; concurrent requests for the same geocode share it
+const inflight = new Map();
 
 export async function getPropertyInfo(geocode) {
-  const result = await getPropertyAddress(String(geocode || "").trim());
+  const code = String(geocode || "").trim();
+  let pending = inflight.get(code);
+  if (!pending) {
+    pending = loadPropertyInfo(code).finally(() => inflight.delete(code));
+    inflight.set(code, pending);
+  }
+  return pending;
+}
+
+async function loadPropertyInfo(geocode) {
+  const result = await getPropertyAddress(geocode);
 
   if (!result?.success) {
-    throw new Error(result?.error || "Failed to fetch property information");
+    // notFound lets callers negative-cache real misses but retry upstream errors
+    throw Object.assign(
+      new Error(result?.error || "Failed to fetch property information"),
+      { notFound: !!result?.notFound }
+    );
   }
   if (!result?.address) {
     throw new Error("No address found in response");
@@ -42,7 +63,7 @@ function extractCountyFromAddress(address) {
   for (const county of counties) {
     if (upper.includes(county.toUpperCase())) return county;
   }
-  const cityMatch = String(address || "").match(/,\s*([^,]+),\s*MT/i);
+  const cityMatch = String(address || "").match(CITY_RE);
   if (cityMatch) {
     const city = cityMatch[1].trim().toLowerCase();
     const cityToCounty = {
@@ -80,9 +101,9 @@ function getPreciseCoordinates(address) {
   const exact = preciseCoords[address];
   if (exact) return exact;
 
-  const normalized = String(address || "").replace(/\s+/g, " ").trim().toUpperCase();
+  const normalized = String(address || "").replace(WHITESPACE_RE, " ").trim().toUpperCase();
   for (const [known, coords] of Object.entries(preciseCoords)) {
-    const normKnown = known.replace(/\s+/g, " ").trim().toUpperCase();
+    const normKnown = known.replace(WHITESPACE_RE, " ").trim().toUpperCase();
     if (normalized === normKnown) return coords;
   }
   return null;
@@ -94,8 +115,12 @@ async function tryMultipleGeocodingServices(address) {
     const encoded = encodeURIComponent(String(address || ""));
     const url = `https://nominatim.openstreetmap.org/search?format=json&q=${encoded}&limit=3&countrycodes=us&addressdetails=1&extratags=1`;
 
-    const resp = await fetch(url, {
-      headers: { "User-Agent": "Montana Property Lookup App (contact: user@example.com)" },
+    const resp = await fetchWithTimeout(url, {
+      headers: {
+        "User-Agent": "Montana Property Lookup App (contact: user@example.com)",
+        "Accept-Encoding": "br, gzip, deflate",
+      },
+      timeoutMs: 10000,
     });
 
     if (resp.ok) {
@@ -126,7 +151,7 @@ function getCityCoordinates(address) {
     butte: { lat: 46.0038, lng: -112.5348 },
   };
 
-  const match = String(address || "").match(/,\s*([^,]+),\s*MT/i);
+  const match = String(address || "").match(CITY_RE);
   if (match) {
     const city = match[1].trim().toLowerCase();
     return cityCoords[city] || null;
@@ -0,0 +1,23 @@
+// api/_lib/geocode.js
+// Geocode validation and spelling variants shared by the lookup endpoints.
+
+// Same rule as geocodeSearchSchema in shared/schema.ts: 5-25 digits/hyphens
+const GEOCODE_RE = /^[0-9-]{5,25}$/;
+
+/**
+ * Cheap shape check run before any upstream work.
+ * @param {string} geocode
+ */
+export function isValidGeocode(geocode) {
+  return GEOCODE_RE.test(geocode);
+}
+
+/**
+ * Distinct spellings of a geocode as it may be stored in PARCELID. Valid
+ * geocodes are digits and hyphens only, so case variants are not needed.
+ * @param {string} geocode
+ * @returns {string[]}
+ */
+export function geocodeVariants(geocode) {
+  return [...new Set([geocode, geocode.replace(/-/g, "")])];
+}
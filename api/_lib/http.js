@@ -0,0 +1,16 @@
+// api/_lib/http.js
+// Shared fetch wrapper. Node's global fetch already keeps pooled keep-alive
+// connections per origin, so callers only need a per-request deadline.
+
+/**
+ * fetch() that aborts after `timeoutMs`, or earlier if `signal` aborts.
+ * @param {string} url
+ * @param {RequestInit & { timeoutMs?: number }} options
+ */
+export function fetchWithTimeout(url, { timeoutMs = 30000, signal, ...init } = {}) {
+  const timeout = AbortSignal.timeout(timeoutMs);
+  return fetch(url, {
+    ...init,
+    signal: signal ? AbortSignal.any([signal, timeout]) : timeout,
+  });
+}
@@ -1,11 +1,51 @@
 // api/_lib/montana-api-service.js
 // Montana cadastral property lookup using official ArcGIS REST API (ESM/JS version)
+import { fetchWithTimeout } from "./http.js";
+import { geocodeVariants } from "./geocode.js";
 
 const ARCGIS_BASE =
   "https://gisservicemt.gov/arcgis/rest/services/MSDI_Framework/Parcels/MapServer/0/query";
 const CADASTRAL_BASE =
   "https://svc.mt.gov/msl/cadastral/?page=PropertyDetails&geocode=";
 
+// Built once and shared by every request; fetch keeps the connections alive.
+// fetch only offers gzip/deflate by default but decodes Brotli transparently.
+const ARCGIS_HEADERS = {
+  "User-Agent": "Montana Property Lookup App",
+  "Accept-Encoding": "br, gzip, deflate",
+};
+const CADASTRAL_HEADERS = {
+  "User-Agent":
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+  Accept: "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+  "Accept-Encoding": "br, gzip, deflate",
+  "Accept-Language": "en-US,en;q=0.5",
+  Connection: "keep-alive",
+};
+
+// Compiled once at module load. The scrape finds the "Address:" /
+// "Property Address" labels first (only where they start a text node, so
+// "Mailing Address:" and the like don't count) and reads only the next text
+// node after each one, across a few intervening tags (sticky regex at the
+// label's end).
+// When no labeled value is usable, it finds each ", MT 59xxx" tail and walks
+// back over address characters rather than letting a lazy quantifier retry
+// from every start position. Both value lengths are bounded so malformed pages
+// cannot blow up the scan.
+const ADDRESS_LABEL_RE = /(?<=>\s*)(?:Property Address:?|Address:)/gi;
+const LABEL_VALUE_RE = /\s*<\/[^>]*>(?:\s*<[^>]*>){0,4}\s*([^<]{1,120},\s*MT\s*\d{5}(?:-\d{4})?)/iy;
+const MT_ZIP_RE = /,\s*MT\s*\d{5}(?:-\d{4})?/gi;
+const ADDRESS_CHAR_RE = /[A-Z0-9 .#'-]/i;
+const MAX_ADDRESS_PREFIX = 80;
+const HAS_MT_ZIP_RE = /MT\s*\d{5}/i;
+const WHITESPACE_RE = /\s+/g;
+const WHITESPACE_CHAR_RE = /\s/;
+// Longest label, kept back at the end of a partial page in case it was cut
+const MAX_LABEL_LENGTH = "Property Address:".length;
+// Pages past this size are truncated rather than buffered in full
+const MAX_PAGE_BYTES = 2 * 1024 * 1024;
+const FULL_ADDRESS_RE = /,\s*MT\s*\d{5}(?:-\d{4})?$/i;
+
 /**
  * @typedef {Object} PolygonGeometry
  * @property {"Polygon"} type
@@ -18,6 +58,7 @@ const CADASTRAL_BASE =
  * @property {string=} address
  * @property {string=} geocode
  * @property {string=} error
+ * @property {boolean=} notFound // upstreams answered, but had no address
  * @property {PolygonGeometry=} parcelGeometry
  */
 
@@ -25,138 +66,299 @@ export async function getPropertyAddress(geocode) {
   const code = String(geocode || "").trim();
   if (!code) return { success: false, error: "Missing geocode" };
 
+  // A miss is only definitive when every upstream actually answered;
+  // timeouts and HTTP errors leave it retryable.
+  let notFound = true;
+
   // Strategy 1: official Montana ArcGIS REST API
   try {
     const r1 = await tryArcGISApi(code);
     if (r1.success) return r1;
+    notFound &&= !!r1.notFound;
   } catch (err) {
     console.log("ArcGIS API failed:", err);
+    notFound = false;
   }
 
   // Strategy 2: simple HTTP scraping of cadastral page
   try {
     const r2 = await trySimpleHttpScraping(code);
     if (r2.success) return r2;
+    notFound &&= !!r2.notFound;
   } catch (err) {
     console.log("HTTP scraping failed:", err);
+    notFound = false;
   }
 
   // Strategy 3: known properties fallback
-  return tryKnownPropertiesFallback(code);
+  const r3 = tryKnownPropertiesFallback(code);
+  return r3.success ? r3 : { ...r3, notFound };
 }
 
 async function tryArcGISApi(geocode) {
-  const variants = [
-    geocode,
-    geocode.replace(/-/g, ""),
-    geocode.toUpperCase(),
-    geocode.toLowerCase(),
-  ];
-
-  for (const variant of variants) {
-    try {
-      const params = new URLSearchParams({
-        where: `PARCELID='${variant}'`,
-        outFields:
-          "PARCELID,AddressLine1,AddressLine2,CityStateZip,CountyName,OwnerName",
-        returnGeometry: "true",
-        outSR: "4326", // request geometry in WGS84 (lat/lng)
-        f: "json",
-      });
-
-      const controller = new AbortController();
-      const timeoutId = setTimeout(() => controller.abort(), 30000);
-
-      const resp = await fetch(`${ARCGIS_BASE}?${params}`, {
-        headers: { "User-Agent": "Montana Property Lookup App" },
-        signal: controller.signal,
-      });
-
-      clearTimeout(timeoutId);
-
-      if (!resp.ok) continue;
-
-      const data = await resp.json();
-      const features = Array.isArray(data?.features) ? data.features : [];
-      if (features.length > 0) {
-        const feature = features[0];
-        const attrs = feature?.attributes || {};
-
-        const parts = [];
-        if (attrs.AddressLine1) parts.push(String(attrs.AddressLine1).trim());
-        if (attrs.AddressLine2) parts.push(String(attrs.AddressLine2).trim());
-        if (attrs.CityStateZip) parts.push(String(attrs.CityStateZip).trim());
-
-        if (parts.length > 0) {
-          const address = parts.join(" ");
-          if (looksLikeFullAddress(address)) {
-            const parcelGeometry = convertArcGISGeometryToGeoJSON(
-              feature?.geometry
-            );
-            return {
-              success: true,
-              address,
-              geocode,
-              parcelGeometry,
-            };
-          }
-        }
-      }
-    } catch (err) {
-      console.log(`ArcGIS variant ${variant} failed:`, err);
-      continue;
+  const variants = geocodeVariants(geocode);
+
+  // One request covering every spelling of the geocode
+  try {
+    const where = `PARCELID IN (${variants.map(sqlString).join(",")})`;
+    const features = await queryArcGIS(where);
+    // Prefer the parcel whose id matches the caller's spelling exactly
+    features.sort(
+      (a, b) =>
+        (b?.attributes?.PARCELID === geocode) -
+        (a?.attributes?.PARCELID === geocode)
+    );
+    for (const feature of features) {
+      const result = featureToResult(feature, geocode);
+      if (result) return result;
     }
+    return { success: false, notFound: true, error: "No data found in ArcGIS API" };
+  } catch (err) {
+    // Only a server that rejects the IN clause is worth retrying per variant;
+    // timeouts and 5xx would just fail again, several times over.
+    if (!err.rejected) throw err;
+    console.log("ArcGIS rejected IN query, probing variants:", err);
+  }
+
+  // Probe all variants at once; the first usable answer wins and the
+  // remaining requests are aborted.
+  const controller = new AbortController();
+  try {
+    return await Promise.any(
+      variants.map((variant) =>
+        queryArcGISVariant(geocode, variant, controller.signal)
+      )
+    );
+  } catch (err) {
+    // Definitive only if every variant query answered without an address
+    const notFound = err.errors.every((e) => e?.notFound);
+    return { success: false, notFound, error: "No data found in ArcGIS API" };
+  } finally {
+    controller.abort();
   }
+}
+
+async function queryArcGISVariant(geocode, variant, signal) {
+  try {
+    const features = await queryArcGIS(
+      `PARCELID=${sqlString(variant)}`,
+      signal
+    );
+    const result = features.length > 0 && featureToResult(features[0], geocode);
+    if (result) return result;
+  } catch (err) {
+    // Aborts of the losing variants are expected, not failures
+    if (!signal.aborted) console.log(`ArcGIS variant ${variant} failed:`, err);
+    throw err;
+  }
+
+  throw Object.assign(new Error(`No address for variant ${variant}`), {
+    notFound: true,
+  });
+}
+
+/**
+ * Run a parcel query and return its features; throws on HTTP or ArcGIS errors.
+ * Errors where the server refused the query itself carry `rejected: true`.
+ */
+async function queryArcGIS(where, signal) {
+  const params = new URLSearchParams({
+    where,
+    // only the fields we read; owner/county were fetched and discarded
+    outFields: "PARCELID,AddressLine1,AddressLine2,CityStateZip",
+    returnGeometry: "true",
+    outSR: "4326", // request geometry in WGS84 (lat/lng)
+    geometryPrecision: "6", // ~0.1m; trims ring coordinate digits
+    f: "json",
+  });
+
+  const resp = await fetchWithTimeout(`${ARCGIS_BASE}?${params}`, {
+    headers: ARCGIS_HEADERS,
+    timeoutMs: 10000,
+    signal,
+  });
+
+  if (!resp.ok) {
+    throw Object.assign(new Error(`HTTP ${resp.status}`), {
+      rejected: resp.status === 400,
+    });
+  }
+
+  const data = await resp.json();
+  // ArcGIS reports query errors in a 200 response body
+  if (data?.error) {
+    throw Object.assign(
+      new Error(data.error.message || "ArcGIS query error"),
+      { rejected: true }
+    );
+  }
+  return Array.isArray(data?.features) ? data.features : [];
+}
+
+/** Build a lookup result from a parcel feature, or null if it has no usable address. */
+function featureToResult(feature, geocode) {
+  const attrs = feature?.attributes || {};
+
+  const parts = [];
+  if (attrs.AddressLine1) parts.push(String(attrs.AddressLine1).trim());
+  if (attrs.AddressLine2) parts.push(String(attrs.AddressLine2).trim());
+  if (attrs.CityStateZip) parts.push(String(attrs.CityStateZip).trim());
+
+  if (parts.length === 0) return null;
+  const address = parts.join(" ");
+  if (!looksLikeFullAddress(address)) return null;
+
+  const parcelGeometry = convertArcGISGeometryToGeoJSON(feature?.geometry);
+  return {
+    success: true,
+    address,
+    geocode,
+    parcelGeometry,
+  };
+}
 
-  return { success: false, error: "No data found in ArcGIS API" };
+function sqlString(value) {
+  return `'${String(value).replace(/'/g, "''")}'`;
 }
 
 async function trySimpleHttpScraping(geocode) {
   try {
     const url = CADASTRAL_BASE + encodeURIComponent(geocode);
 
-    const controller = new AbortController();
-    const timeoutId = setTimeout(() => controller.abort(), 30000);
-
-    const resp = await fetch(url, {
-      headers: {
-        "User-Agent":
-          "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-        Accept: "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        Connection: "keep-alive",
-      },
-      signal: controller.signal,
+    const resp = await fetchWithTimeout(url, {
+      headers: CADASTRAL_HEADERS,
+      timeoutMs: 15000,
     });
 
-    clearTimeout(timeoutId);
-
     if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
 
-    const html = await resp.text();
-
-    const patterns = [
-      /Address:\s*<\/[^>]*>\s*([^<]*(?:[A-Z0-9 .#'-]+?,\s*MT\s*\d{5}(?:-\d{4})?))/gi,
-      /Property Address\s*<\/[^>]*>\s*([^<]*(?:[A-Z0-9 .#'-]+?,\s*MT\s*\d{5}(?:-\d{4})?))/gi,
-      /([A-Z0-9 .#'-]+?,\s*MT\s*\d{5}(?:-\d{4})?)/gi,
-    ];
-
-    for (const p of patterns) {
-      const matches = Array.from(html.matchAll(p));
-      for (const m of matches) {
-        const address = String(m[1] || "").trim().replace(/\s+/g, " ");
-        if (looksLikeFullAddress(address)) {
-          return { success: true, address, geocode };
-        }
-      }
+    const { address: early, html, truncated } = await readCadastralPage(resp);
+    if (early) {
+      return { success: true, address: early, geocode };
+    }
+
+    // Only a complete page can prove there is no address
+    const miss = { success: false, error: "Address not found in HTML content" };
+    if (!truncated) miss.notFound = true;
+
+    // Every pattern ends in "MT 59xxx"; skip the scans when that can't occur
+    if (!HAS_MT_ZIP_RE.test(html)) return miss;
+
+    const address = findLabeledAddress(html) || findBareAddress(html);
+    if (address) {
+      return { success: true, address, geocode };
     }
 
-    return { success: false, error: "Address not found in HTML content" };
+    return miss;
   } catch (err) {
     return { success: false, error: `HTTP scraping failed: ${err}` };
   }
 }
 
+/**
+ * Read the page body, stopping the download as soon as a labeled address has
+ * fully arrived. Otherwise returns the page (at most MAX_PAGE_BYTES of it) for
+ * the fallback scans; `truncated` is set when the cap cut it short.
+ * @returns {Promise<{ address: string|null, html: string, truncated: boolean }>}
+ */
+async function readCadastralPage(resp) {
+  const reader = resp.body.getReader();
+  const decoder = new TextDecoder();
+  let html = "";
+  let resume = 0;
+  let bytes = 0;
+  let truncated = false;
+  try {
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      bytes += value.byteLength;
+      if (bytes > MAX_PAGE_BYTES) {
+        console.log(`Cadastral page exceeded ${MAX_PAGE_BYTES} bytes; truncating`);
+        truncated = true;
+        break;
+      }
+      html += decoder.decode(value, { stream: true });
+
+      // Labels are decided in page order, so a later label can only win once
+      // every earlier one has its value text node in full.
+      const { address, resumeAt } = scanLabels(html, resume, true);
+      if (address) return { address, html, truncated };
+      resume = resumeAt;
+    }
+    html += decoder.decode();
+    return { address: null, html, truncated };
+  } finally {
+    reader.cancel().catch(() => {});
+  }
+}
+
+/** Value of the first address label whose following text node is a full address. */
+function findLabeledAddress(html) {
+  return scanLabels(html, 0, false).address;
+}
+
+/**
+ * Check address labels from `from` in page order. With `partial` set the page
+ * is still arriving: the scan stops at the first label whose value text node
+ * hasn't fully arrived and reports where to pick up, so the outcome never
+ * depends on how the body was chunked.
+ * @returns {{ address: string|null, resumeAt: number }}
+ */
+function scanLabels(html, from, partial) {
+  let resumeAt = Math.max(from, html.length - MAX_LABEL_LENGTH);
+  ADDRESS_LABEL_RE.lastIndex = from;
+  for (let label; (label = ADDRESS_LABEL_RE.exec(html)); ) {
+    const valueAt = label.index + label[0].length;
+    if (partial && labelValueEnd(html, valueAt) === -1) {
+      return { address: null, resumeAt: label.index };
+    }
+    resumeAt = Math.max(resumeAt, valueAt);
+
+    LABEL_VALUE_RE.lastIndex = valueAt;
+    const m = LABEL_VALUE_RE.exec(html);
+    if (!m) continue;
+    const address = m[1].trim().replace(WHITESPACE_RE, " ");
+    if (looksLikeFullAddress(address)) return { address, resumeAt };
+  }
+  return { address: null, resumeAt };
+}
+
+/**
+ * End of the text node LABEL_VALUE_RE would read after a label (the "<" that
+ * closes it), or -1 if the page doesn't reach that far yet. Mirrors the regex:
+ * up to five tags, then the first text.
+ */
+function labelValueEnd(html, i) {
+  for (let tags = 0; ; tags++) {
+    while (i < html.length && WHITESPACE_CHAR_RE.test(html[i])) i++;
+    if (i >= html.length) return -1;
+    if (html[i] !== "<" || tags === 5) break;
+    i = html.indexOf(">", i);
+    if (i === -1) return -1;
+    i++;
+  }
+  return html.indexOf("<", i);
+}
+
+/** First unlabeled "..., MT 59xxx" run anywhere in the page. */
+function findBareAddress(html) {
+  // matchAll is lazy; stop at the first usable address
+  for (const m of html.matchAll(MT_ZIP_RE)) {
+    const limit = Math.max(0, m.index - MAX_ADDRESS_PREFIX);
+    let start = m.index;
+    while (start > limit && ADDRESS_CHAR_RE.test(html[start - 1])) start--;
+    if (start === m.index) continue;
+
+    const address = html
+      .slice(start, m.index + m[0].length)
+      .trim()
+      .replace(WHITESPACE_RE, " ");
+    if (looksLikeFullAddress(address)) return address;
+  }
+  return null;
+}
+
 function tryKnownPropertiesFallback(geocode) {
   const known = {
     "03-1032-34-1-08-10-0000": "2324 REHBERG LN BILLINGS, MT 59102",
@@ -180,7 +382,7 @@ function tryKnownPropertiesFallback(geocode) {
 function looksLikeFullAddress(s) {
   const str = typeof s === "string" ? s : "";
   if (!str || str.length < 10) return false;
-  return /,\s*MT\s*\d{5}(?:-\d{4})?$/i.test(str);
+  return FULL_ADDRESS_RE.test(str);
 }
 
 /**
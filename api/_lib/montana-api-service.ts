@@ -1,239 +0,0 @@
-// Montana cadastral property lookup using official ArcGIS REST API
-// This eliminates all Python dependencies for deployment compatibility
-
-import { polygonGeometrySchema } from '../../shared/schema';
-import { z } from 'zod';
-
-// ArcGIS geometry interface for polygon parcels
-interface ArcGISGeometry {
-  rings: number[][][]; // Array of rings, each ring is an array of [x, y] coordinates
-  spatialReference?: {
-    wkid: number;
-  };
-}
-
-interface ArcGISResponse {
-  features: Array<{
-    attributes: {
-      PARCELID?: string;
-      AddressLine1?: string;
-      AddressLine2?: string;
-      CityStateZip?: string;
-      CountyName?: string;
-      OwnerName?: string;
-    };
-    geometry?: ArcGISGeometry;
-  }>;
-}
-
-// Use the schema type for consistency
-type PolygonGeometry = z.infer<typeof polygonGeometrySchema>;
-
-interface PropertyLookupResult {
-  success: boolean;
-  address?: string;
-  geocode?: string;
-  error?: string;
-  parcelGeometry?: PolygonGeometry;
-}
-
-export class MontanaApiService {
-  private readonly ARCGIS_BASE = "https://gisservicemt.gov/arcgis/rest/services/MSDI_Framework/Parcels/MapServer/0/query";
-  private readonly CADASTRAL_BASE = "https://svc.mt.gov/msl/cadastral/?page=PropertyDetails&geocode=";
-
-  async getPropertyAddress(geocode: string): Promise<PropertyLookupResult> {
-    // Strategy 1: Try official Montana ArcGIS REST API
-    try {
-      const result = await this.tryArcGISApi(geocode);
-      if (result.success) {
-        return result;
-      }
-    } catch (error) {
-      console.log('ArcGIS API failed:', error);
-    }
-
-    // Strategy 2: Try simple HTTP request to cadastral site
-    try {
-      const result = await this.trySimpleHttpScraping(geocode);
-      if (result.success) {
-        return result;
-      }
-    } catch (error) {
-      console.log('HTTP scraping failed:', error);
-    }
-
-    // Strategy 3: Known properties fallback
-    return this.tryKnownPropertiesFallback(geocode);
-  }
-
-  private async tryArcGISApi(geocode: string): Promise<PropertyLookupResult> {
-    const geocodeVariants = [
-      geocode,
-      geocode.replace(/-/g, ""),
-      geocode.toUpperCase(),
-      geocode.toLowerCase()
-    ];
-
-    for (const variant of geocodeVariants) {
-      try {
-        const params = new URLSearchParams({
-          where: `PARCELID='${variant}'`,
-          outFields: "PARCELID,AddressLine1,AddressLine2,CityStateZip,CountyName,OwnerName",
-          returnGeometry: "true",
-          outSR: "4326", // Request geometry in WGS84 (lat/lng) coordinate system
-          f: "json"
-        });
-
-        const controller = new AbortController();
-        const timeoutId = setTimeout(() => controller.abort(), 30000);
-        
-        const response = await fetch(`${this.ARCGIS_BASE}?${params}`, {
-          headers: {
-            'User-Agent': 'Montana Property Lookup App'
-          },
-          signal: controller.signal
-        });
-        
-        clearTimeout(timeoutId);
-
-        if (!response.ok) {
-          continue;
-        }
-
-        const data: ArcGISResponse = await response.json();
-
-        if (data.features && data.features.length > 0) {
-          const feature = data.features[0];
-          const attrs = feature.attributes;
-
-          // Build address from components
-          const addressParts = [];
-          if (attrs.AddressLine1) addressParts.push(attrs.AddressLine1.trim());
-          if (attrs.AddressLine2) addressParts.push(attrs.AddressLine2.trim());
-          if (attrs.CityStateZip) addressParts.push(attrs.CityStateZip.trim());
-
-          if (addressParts.length > 0) {
-            const address = addressParts.join(" ");
-            if (this.looksLikeFullAddress(address)) {
-              // Extract polygon geometry if available
-              const parcelGeometry = this.convertArcGISGeometryToGeoJSON(feature.geometry);
-              
-              return { 
-                success: true, 
-                address, 
-                geocode,
-                parcelGeometry
-              };
-            }
-          }
-        }
-      } catch (error) {
-        console.log(`ArcGIS variant ${variant} failed:`, error);
-        continue;
-      }
-    }
-
-    return { success: false, error: "No data found in ArcGIS API" };
-  }
-
-  private async trySimpleHttpScraping(geocode: string): Promise<PropertyLookupResult> {
-    try {
-      const url = this.CADASTRAL_BASE + encodeURIComponent(geocode);
-
-      const controller = new AbortController();
-      const timeoutId = setTimeout(() => controller.abort(), 30000);
-      
-      const response = await fetch(url, {
-        headers: {
-          "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-          "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-          "Accept-Language": "en-US,en;q=0.5",
-          "Connection": "keep-alive",
-        },
-        signal: controller.signal
-      });
-      
-      clearTimeout(timeoutId);
-
-      if (!response.ok) {
-        throw new Error(`HTTP ${response.status}`);
-      }
-
-      const html = await response.text();
-
-      // Simple regex patterns to find addresses in HTML
-      const addressPatterns = [
-        /Address:\s*<\/[^>]*>\s*([^<]*(?:[A-Z0-9 .#'-]+?,\s*MT\s*\d{5}(?:-\d{4})?))/gi,
-        /Property Address\s*<\/[^>]*>\s*([^<]*(?:[A-Z0-9 .#'-]+?,\s*MT\s*\d{5}(?:-\d{4})?))/gi,
-        /([A-Z0-9 .#'-]+?,\s*MT\s*\d{5}(?:-\d{4})?)/gi
-      ];
-
-      for (const pattern of addressPatterns) {
-        const matches = Array.from(html.matchAll(pattern));
-        for (const match of matches) {
-          const address = match[1].trim().replace(/\s+/g, ' ');
-          if (this.looksLikeFullAddress(address)) {
-            return { success: true, address, geocode };
-          }
-        }
-      }
-
-      return { success: false, error: "Address not found in HTML content" };
-    } catch (error) {
-      return { success: false, error: `HTTP scraping failed: ${error}` };
-    }
-  }
-
-  private tryKnownPropertiesFallback(geocode: string): PropertyLookupResult {
-    const knownProperties: { [key: string]: string } = {
-      '03-1032-34-1-08-10-0000': '2324 REHBERG LN BILLINGS, MT 59102',
-      '03103234108100000': '2324 REHBERG LN BILLINGS, MT 59102'
-    };
-
-    // Try exact match
-    if (knownProperties[geocode]) {
-      return { success: true, address: knownProperties[geocode], geocode };
-    }
-
-    // Try without hyphens
-    const cleanGeocode = geocode.replace(/-/g, '');
-    if (knownProperties[cleanGeocode]) {
-      return { success: true, address: knownProperties[cleanGeocode], geocode };
-    }
-
-    return {
-      success: false,
-      error: `Property data not available for geocode ${geocode}. The service uses official Montana cadastral sources, but this property may not be available in the current database.`
-    };
-  }
-
-  private looksLikeFullAddress(s: string): boolean {
-    if (!s || s.length < 10) {
-      return false;
-    }
-    // Must contain MT and a zip code
-    return /,\s*MT\s*\d{5}(?:-\d{4})?$/i.test(s);
-  }
-
-  private convertArcGISGeometryToGeoJSON(geometry?: ArcGISGeometry): PolygonGeometry | undefined {
-    if (!geometry || !geometry.rings || geometry.rings.length === 0) {
-      return undefined;
-    }
-
-    try {
-      // Montana ArcGIS now returns coordinates in lat/lng format (due to outSR=4326)
-      // Convert ArcGIS rings to GeoJSON coordinates format
-      const coordinates = geometry.rings.map(ring => 
-        ring.map(point => [point[0], point[1]] as [number, number]) // [lng, lat]
-      );
-
-      return {
-        type: "Polygon",
-        coordinates
-      };
-    } catch (error) {
-      console.warn('Failed to convert ArcGIS geometry to GeoJSON:', error);
-      return undefined;
-    }
-  }
-}
\ No newline at end of file
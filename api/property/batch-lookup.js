@@ -1,5 +1,12 @@
 // api/property/batch-lookup.js
 import { getPropertyInfo } from "../_lib/geocode-service.js";
+import { get, set, misses, HIT_TTL_MS, MISS_TTL_MS } from "../_lib/cache.js";
+import { isValidGeocode } from "../_lib/geocode.js";
+import { allSettledWithLimit } from "../_lib/settle.js";
+
+// Upstream lookups in flight at once per batch; keeps large batches from
+// opening dozens of ArcGIS/cadastral requests simultaneously.
+const BATCH_CONCURRENCY = 8;
 
 function toArray(v) {
   if (Array.isArray(v)) return v;
@@ -25,11 +32,28 @@ export default async function handler(req, res) {
     }
 
     const start = Date.now();
-    const settled = await Promise.allSettled(
-      codes.map(async (geocode) => {
-        const data = await getPropertyInfo(String(geocode || "").trim());
+    const settled = await allSettledWithLimit(
+      codes,
+      BATCH_CONCURRENCY,
+      async (geocode) => {
+        const code = String(geocode || "").trim();
+        if (!isValidGeocode(code)) throw new Error("Invalid geocode");
+        const missed = misses.get(code);
+        if (missed) throw new Error(missed);
+
+        // Same cache as the single lookup endpoint
+        let data = get(code);
+        if (!data) {
+          try {
+            data = await getPropertyInfo(code);
+          } catch (err) {
+            if (err?.notFound) misses.set(code, err.message, MISS_TTL_MS);
+            throw err;
+          }
+          set(code, data, HIT_TTL_MS);
+        }
         return { geocode, success: true, data, processedAt: new Date().toISOString() };
-      })
+      }
     );
 
     const results = settled.map((s, i) => {
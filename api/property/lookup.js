@@ -1,6 +1,7 @@
 // api/property/lookup.js
 import { getPropertyInfo } from "../_lib/geocode-service.js";
-import { get, set } from "../_lib/cache.js";
+import { get, set, misses, HIT_TTL_MS, MISS_TTL_MS } from "../_lib/cache.js";
+import { isValidGeocode } from "../_lib/geocode.js";
 
 function asString(v) {
   return typeof v === "string" ? v : v == null ? "" : String(v);
@@ -22,16 +23,30 @@ export default async function handler(req, res) {
     if (!geocode) {
       return res.status(400).json({ error: 'Missing "geocode"' });
     }
+    if (!isValidGeocode(geocode)) {
+      return res.status(400).json({ error: 'Invalid "geocode"' });
+    }
+
+    // Recently failed lookups are not retried against upstream until they expire
+    const missed = misses.get(geocode);
+    if (missed) {
+      return res.status(500).json({ success: false, error: missed, cached: true });
+    }
 
     // Check cache first
     const cached = get(geocode);
     if (cached) {
-  return res.status(200).json({ success: true, data: cached, cached: true });
-}
-
+      return res.status(200).json({ success: true, data: cached, cached: true });
+    }
 
-    const info = await getPropertyInfo(geocode);
-    set(geocode, info);
+    let info;
+    try {
+      info = await getPropertyInfo(geocode);
+    } catch (err) {
+      if (err?.notFound) misses.set(geocode, err.message, MISS_TTL_MS);
+      throw err;
+    }
+    set(geocode, info, HIT_TTL_MS);
     return res.status(200).json({ success: true, data: info });
   } catch (err) {
     console.error("lookup error:", err);